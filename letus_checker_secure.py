@@ -14,7 +14,7 @@ LETUS Assignment Checker — Secure Edition
 Dependencies
 ------------
 ```bash
-pip install playwright keyring python‑dotenv rich requests
+pip install playwright keyring python‑dotenv rich aiohttp
 playwright install chromium
 ```
 Compatible with Python 3.11+ without the legacy `asyncio-run-in-process` helper.
@@ -34,23 +34,53 @@ python letus_checker_secure.py --watch 30 --due-within 6
 
 NOTE ✱ Never commit your credentials; this script uses the OS credential vault (macOS Keychain,
 Windows Credential Manager, or Secret Service on Linux) so they stay off‑disk.  You may still set
-`LINE_NOTIFY_TOKEN` in `.env` or during `--configure`.
+`LINE_NOTIFY_TOKEN` in `.env` or during `--configure`.  After a successful login the browser
+session (cookies only, no password) is cached in `~/.letus_state.json` so later runs can skip
+the SSO round‑trip; `--clear` removes it.
 """
 from __future__ import annotations
-import argparse, asyncio, datetime as dt, os, re, textwrap
+import argparse, asyncio, contextlib, datetime as dt, functools, getpass, json, math, os, re, tempfile, textwrap
 from pathlib import Path
 from typing import List, Optional
 from zoneinfo import ZoneInfo
-import keyring, requests
+import aiohttp, keyring
 from dotenv import load_dotenv
 from rich import print
 from rich.console import Console
 from rich.table import Table
-from playwright.async_api import async_playwright, BrowserContext
+from playwright.async_api import async_playwright, BrowserContext, TimeoutError as PlaywrightTimeoutError
 
 SERVICE = "LETUS_CHECKER"
 JST = ZoneInfo("Asia/Tokyo")
 DASHBOARD_URL = "https://letus.ed.tus.ac.jp/my/"
+STATE_PATH = Path("~/.letus_state.json").expanduser()
+# drop browser services a headless scraper never uses; trims Chromium start-up
+CHROMIUM_ARGS = [
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-features=Translate,BackForwardCache",
+]
+# images and fonts, matched in-browser via CDP (incl. Moodle's extension-less theme assets).
+# Stylesheets must still load: fetch_upcoming reads innerText, which drops display:none content.
+BLOCKED_URL_PATTERNS = [
+    "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.svg*", "*.webp*", "*.ico*",
+    "*.woff*", "*.ttf*",
+    "*/theme/image.php/*", "*/theme/font.php/*",
+]
+MAX_CONCURRENT_CHECKS = 8  # parallel assignment-page fetches; keep LETUS load modest
+
+_DUE_RE = re.compile(r"""
+    (?P<y>\d{4})年(?P<m>\d{1,2})月(?P<d>\d{1,2})日\s*(?P<hh>\d{1,2}):(?P<mm>\d{2})
+  | (?P<d2>\d{1,2})\s+
+    (?P<mon>January|February|March|April|May|June|July|August|September|October|November|December)
+    \s+(?P<y2>\d{4}).*?(?P<hh2>\d{1,2}):(?P<mm2>\d{2})\s*(?P<ap>AM|PM)
+""", re.I | re.X)
+_MONTHS = {"jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+           "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12}
+_DASHBOARD_PATH_RE = re.compile(r"/my/")
 
 console = Console()
 
@@ -64,6 +94,65 @@ def get_secret(key: str) -> Optional[str]:
     return keyring.get_password(SERVICE, key)
 
 
+def save_secrets(d: dict):
+    keyring.set_password(SERVICE, "BLOB", json.dumps(d))
+
+
+def load_secrets() -> dict:
+    blob = keyring.get_password(SERVICE, "BLOB")
+    if not blob:
+        return {}
+    try:
+        creds = json.loads(blob)
+    except ValueError:
+        creds = None
+    if not isinstance(creds, dict):
+        raise RuntimeError("Credentials not stored; run with --configure first.")
+    return creds
+
+
+def load_credentials() -> tuple[Optional[str], Optional[str]]:
+    creds = load_secrets()
+    if not creds:
+        # per-key entries from older --configure runs: move them into the blob once
+        creds = {k: get_secret(k) for k in ("USERNAME", "PASSWORD")}
+        if all(creds.values()):
+            save_secrets(creds)
+            clear_secret("USERNAME")
+            clear_secret("PASSWORD")
+    return creds.get("USERNAME"), creds.get("PASSWORD")
+
+
+def save_session_state(state: dict):
+    # the cookies are as good as a password while valid: write a 0600 temp file (mkstemp's
+    # mode) and swap it in, so an older looser file or a crash mid-write never leaks/truncates
+    fd, tmp = tempfile.mkstemp(dir=STATE_PATH.parent, prefix=STATE_PATH.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, STATE_PATH)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+def load_session_state() -> Optional[dict]:
+    try:
+        state = json.loads(STATE_PATH.read_text())
+    except ValueError:
+        state = None
+    except OSError:
+        # missing or unreadable (a directory, no permission): start fresh, leave the path alone
+        return None
+    if not isinstance(state, dict):
+        # truncated or corrupt cache; drop it so the next login writes a fresh one
+        with contextlib.suppress(OSError):
+            STATE_PATH.unlink()
+        return None
+    return state
+
+
 def clear_secret(key: str):
     try:
         keyring.delete_password(SERVICE, key)
@@ -71,139 +160,233 @@ def clear_secret(key: str):
         pass
 
 
+@functools.lru_cache(maxsize=1024)  # timeline labels mostly recur between --watch ticks
 def parse_due_date(text: str) -> Optional[dt.datetime]:
-    jp = re.search(r"(\d{4})年(\d{1,2})月(\d{1,2})日\s*(\d{1,2}):(\d{2})", text)
-    if jp:
-        y, m, d, hh, mm = map(int, jp.groups())
-        return dt.datetime(y, m, d, hh, mm, tzinfo=JST)
-    en = re.search(r"(\d{1,2})\s+(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{4}).*?(\d{1,2}):(\d{2})\s*(AM|PM)", text, re.I)
-    if en:
-        d, mon, y, hh, mm, ampm = en.groups()
-        month_idx = dt.datetime.strptime(mon[:3], "%b").month
-        hh = int(hh) % 12 + (12 if ampm.lower() == "pm" else 0)
-        return dt.datetime(int(y), month_idx, int(d), hh, int(mm), tzinfo=JST)
-    return None
-
-
-def notify(alerts: List[dict]):
-    token = os.getenv("LINE_NOTIFY_TOKEN") or get_secret("LINE_TOKEN")
+    if ":" not in text:  # both formats need hh:mm; skips the regex for most non-deadline items
+        return None
+    m = _DUE_RE.search(text)
+    if not m:
+        return None
+    if m.group("y") is not None:
+        y, mo, d, hh, mm = map(int, m.group("y", "m", "d", "hh", "mm"))
+        return dt.datetime(y, mo, d, hh, mm, tzinfo=JST)
+    month_idx = _MONTHS[m.group("mon")[:3].lower()]
+    hh = int(m.group("hh2")) % 12 + (12 if m.group("ap").lower() == "pm" else 0)
+    return dt.datetime(int(m.group("y2")), month_idx, int(m.group("d2")), hh, int(m.group("mm2")), tzinfo=JST)
+
+
+@functools.lru_cache(maxsize=1)  # one keyring lookup per process; cache_clear() to re-resolve
+def _resolve_token() -> Optional[str]:
+    return os.getenv("LINE_NOTIFY_TOKEN") or get_secret("LINE_TOKEN")
+
+
+async def notify(alerts: List[dict], http: aiohttp.ClientSession):
+    token = _resolve_token()
     messages = [f"\u26A0 LETUS: 未提出課題 {len(alerts)} 件\n"]
-    now = dt.datetime.now(JST)
+    now_ts = dt.datetime.now(JST).timestamp()
     for t in alerts:
-        hrs = int((t["due"] - now).total_seconds() // 3600)
+        hrs = int((t["due"].timestamp() - now_ts) // 3600)
         messages.append(f"• {t['label']} (あと {hrs}h)")
     msg = "\n".join(messages)
 
     if token:
-        resp = requests.post("https://notify-api.line.me/api/notify",
+        async with http.post("https://notify-api.line.me/api/notify",
                              headers={"Authorization": f"Bearer {token}"},
-                             data={"message": msg})
-        if resp.status_code != 200:
-            console.print(f"[bold red]LINE Notify failed:[/bold red] {resp.text}")
+                             data={"message": msg}) as resp:
+            if resp.status != 200:
+                console.print(f"[bold red]LINE Notify failed:[/bold red] {await resp.text()}")
     else:
         console.print(msg)
 
 # --------------------------- Core --------------------------------------------------------------
 
 class LetusChecker:
-    def __init__(self, context: BrowserContext):
+    def __init__(self, context: BrowserContext, http: aiohttp.ClientSession):
         self.ctx = context
+        self.http = http
+        # per-link HTTP validators and last known state, for conditional re-checks in --watch
+        self._validators: dict[str, dict[str, str]] = {}
+        self._submitted: dict[str, bool] = {}
 
-    async def login(self):
+    async def new_page(self):
         page = await self.ctx.new_page()
-        await page.goto(DASHBOARD_URL)
-        # ensure any redirects finish before checking login state
-        await page.wait_for_load_state("networkidle")
+        cdp = await self.ctx.new_cdp_session(page)
+        await cdp.send("Network.enable")
+        await cdp.send("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        return page
+
+    async def login(self):
+        page = await self.new_page()
+        # goto follows the server-side redirect to the login page, if any
+        await page.goto(DASHBOARD_URL, wait_until="domcontentloaded")
         if page.url.startswith(DASHBOARD_URL):
             try:
                 if await page.locator('[data-region="timeline"]').count():
                     return page  # cached session
             except Exception:
                 # page navigated while checking; fall through to login
-                await page.wait_for_load_state("networkidle")
+                await page.wait_for_load_state("domcontentloaded")
 
         await page.locator("text=Log in").first.click()
-        await page.wait_for_load_state("networkidle")
-        u = get_secret("USERNAME")
-        p = get_secret("PASSWORD")
+        u, p = load_credentials()
         if not u or not p:
             raise RuntimeError("Credentials not stored; run with --configure first.")
+        await page.wait_for_selector('input[name="j_username"], input[name="username"]')
         await page.fill('input[name="j_username"], input[name="username"]', u)
         await page.fill('input[name="j_password"], input[name="password"]', p)
         await page.keyboard.press("Enter")
-        await page.wait_for_load_state("networkidle")
-        if "ログインエラー" in await page.content():
+        # race the SSO redirect back to /my/ against the error banner; both are tighter than
+        # networkidle, which analytics beacons can hold open indefinitely
+        reached = asyncio.ensure_future(
+            page.wait_for_url(_DASHBOARD_PATH_RE, wait_until="domcontentloaded"))
+        failed = asyncio.ensure_future(page.locator("text=ログインエラー").first.wait_for())
+        done, pending = await asyncio.wait({reached, failed}, return_when=asyncio.FIRST_COMPLETED)
+        for t in pending:
+            t.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        if failed in done and failed.exception() is None:
             raise RuntimeError("Login failed – check credentials/MFA.")
-        await page.goto(DASHBOARD_URL)
-        await page.wait_for_load_state("networkidle")
-        return page
+        try:
+            (reached if reached in done else failed).result()
+        except PlaywrightTimeoutError as exc:
+            raise RuntimeError("Login did not reach the dashboard – check credentials/MFA.") from exc
+        save_session_state(await self.ctx.storage_state())
+        return page  # already on the dashboard; fetch_upcoming navigates there anyway
 
     async def fetch_upcoming(self, page) -> List[dict]:
         await page.goto(DASHBOARD_URL)
         await page.wait_for_selector('[data-region="timeline"]')
-        items = []
-        for itm in await page.locator('[data-region="timeline-item"]').all():
-            label = (await itm.inner_text()).strip()
-            link = await itm.locator('a').get_attribute('href')
-            due = parse_due_date(label)
-            items.append({"label": label, "link": link, "due": due})
-        return items
+        # one CDP round-trip for all items instead of two per item
+        items_raw = await page.evaluate("""() => Array.from(
+            document.querySelectorAll('[data-region="timeline-item"]'),
+            el => ({label: el.innerText.trim(), link: el.querySelector('a')?.href ?? null}))""")
+        return [{**raw, "due": parse_due_date(raw["label"])} for raw in items_raw]
+
+    async def revalidate(self, link: str) -> Optional[bool]:
+        # state of a page rendered on an earlier tick, or None if it has to be rendered again
+        validators = self._validators.get(link)
+        if validators is None:
+            return None
+        # conditional GET sharing the browser's cookies; redirects (e.g. to SSO) are not followed
+        resp = await self.ctx.request.get(link, headers=validators, max_redirects=0)
+        try:
+            if resp.status == 304:
+                return self._submitted[link]
+        finally:
+            await resp.dispose()
+        # changed, redirected or an error: only a fresh render gives a trustworthy answer
+        self._forget(link)
+        return None
 
     async def is_submitted(self, page, link: str) -> bool:
-        await page.goto(link)
-        await page.wait_for_load_state("domcontentloaded")
-        html = await page.content()
-        return ("提出済" in html) or ("Submitted for grading" in html)
+        resp = await page.goto(link, wait_until="domcontentloaded")
+        # count in the renderer instead of shipping the whole DOM back via content()
+        marker = page.locator("text=提出済").or_(page.locator("text=Submitted for grading"))
+        submitted = bool(await marker.count())
+        if resp is not None and resp.status == 200:
+            self._remember(link, resp.headers, submitted)
+        else:
+            self._forget(link)
+        return submitted
+
+    def _remember(self, link: str, headers: dict, submitted: bool):
+        validators = {}
+        if "etag" in headers:
+            validators["If-None-Match"] = headers["etag"]
+        if "last-modified" in headers:
+            validators["If-Modified-Since"] = headers["last-modified"]
+        if validators:
+            self._validators[link] = validators
+            self._submitted[link] = submitted
+        else:
+            self._forget(link)
+
+    def _forget(self, link: str):
+        self._validators.pop(link, None)
+        self._submitted.pop(link, None)
 
     async def run(self, due_within_h: int) -> int:
         page = await self.login()
-        upcoming = await self.fetch_upcoming(page)
-        now = dt.datetime.now(JST)
-        threshold = now + dt.timedelta(hours=due_within_h)
-        alerts: List[dict] = []
-        for task in upcoming:
-            if task["due"] and task["due"] <= threshold:
-                if not await self.is_submitted(page, task["link"]):
-                    alerts.append(task)
-        if alerts:
-            notify(alerts)
-        await page.close()
-        return len(alerts)
+        try:
+            upcoming = await self.fetch_upcoming(page)
+            now = dt.datetime.now(JST)
+            threshold = now + dt.timedelta(hours=due_within_h)
+            # filter before any page work; sorted so alerts list the most urgent task first
+            candidates = sorted((t for t in upcoming if t["due"] and t["due"] <= threshold),
+                                key=lambda t: t["due"])
+            sem = asyncio.Semaphore(MAX_CONCURRENT_CHECKS)
+
+            async def _check(task):
+                async with sem:
+                    submitted = await self.revalidate(task["link"])
+                    if submitted is None:
+                        # only open a page (and its CDP session) when a render is needed
+                        p = await self.new_page()
+                        try:
+                            submitted = await self.is_submitted(p, task["link"])
+                        finally:
+                            await p.close()
+                    return task, submitted
+
+            results = await asyncio.gather(*[_check(t) for t in candidates])
+            alerts: List[dict] = [task for task, submitted in results if not submitted]
+            if alerts:
+                await notify(alerts, self.http)
+            return len(alerts)
+        finally:
+            # one page per tick; closing it even on errors keeps --watch from leaking pages
+            await page.close()
 
 # --------------------------- CLI ---------------------------------------------------------------
 
 def configure():
     console.print("[bold]LETUS Checker: 初期設定[/bold]")
     u = input("学籍番号 (LETUS_USERNAME):")
-    p = input("パスワード (非表示ではありませんので注意): ")
-    token = input("LINE Notify トークン (任意): ")
-    save_secret("USERNAME", u)
-    save_secret("PASSWORD", p)
+    p = getpass.getpass("パスワード: ")
+    token = getpass.getpass("LINE Notify トークン (任意): ")
+    save_secrets({"USERNAME": u, "PASSWORD": p})
+    # per-key entries from older versions would otherwise keep the old password in the vault
+    clear_secret("USERNAME")
+    clear_secret("PASSWORD")
     if token:
         save_secret("LINE_TOKEN", token)
     console.print("[green]保存しました。[/green]")
 
 
 def clear_credentials():
-    """Remove stored credentials from the keyring."""
-    for key in ("USERNAME", "PASSWORD", "LINE_TOKEN"):
+    """Remove stored credentials from the keyring and the cached browser session."""
+    for key in ("BLOB", "USERNAME", "PASSWORD", "LINE_TOKEN"):
         clear_secret(key)
+    STATE_PATH.unlink(missing_ok=True)
     console.print("[yellow]Credentials cleared.[/yellow]")
 
+def _next_wake(next_t: float, now: float, interval: float) -> float:
+    if now > next_t:
+        # the run overran: skip the missed ticks and wait for the next slot on the grid
+        next_t += interval * math.ceil((now - next_t) / interval)
+    return next_t
+
 async def main_async(args):
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch(headless=True)
-        context = await browser.new_context()
-        checker = LetusChecker(context)
+    async with async_playwright() as pw, \
+            aiohttp.ClientSession(headers={"User-Agent": "letus-checker/1.0"}) as http:
+        browser = await pw.chromium.launch(headless=True, args=CHROMIUM_ARGS)
+        context = await browser.new_context(storage_state=load_session_state())
+        checker = LetusChecker(context, http)
         if args.watch:
             interval = args.watch * 60
             console.print(f"Watching LETUS every {args.watch} min… (Ctrl+C で停止)")
+            loop = asyncio.get_running_loop()
+            next_t = loop.time()
             try:
                 while True:
+                    # schedule against a monotonic clock so scrape time doesn't stretch the interval
+                    next_t += interval
                     count = await checker.run(args.due_within)
                     if not args.quiet and count == 0:
                         console.print("[dim]No deadlines soon.[/dim]")
-                    await asyncio.sleep(interval)
+                    now = loop.time()
+                    next_t = _next_wake(next_t, now, interval)
+                    await asyncio.sleep(next_t - now)
             except KeyboardInterrupt:
                 console.print("Stopped.")
         else:
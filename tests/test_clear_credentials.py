@@ -2,7 +2,7 @@ import sys, types, importlib
 
 # Stub heavy dependencies
 for name in [
-    'requests',
+    'aiohttp',
     'dotenv',
     'rich',
     'rich.console',
@@ -26,6 +26,7 @@ sys.modules['rich.table'].Table = type('Table', (), {})
 
 sys.modules['playwright.async_api'].async_playwright = lambda *a, **kw: None
 sys.modules['playwright.async_api'].BrowserContext = type('BrowserContext', (), {})
+sys.modules['playwright.async_api'].TimeoutError = type('TimeoutError', (Exception,), {})
 
 # Prepare fake keyring module
 calls = []
@@ -41,7 +42,17 @@ sys.modules['keyring'] = keyring
 module = importlib.import_module('letus_checker_secure')
 
 
-def test_clear_credentials_calls_delete():
+def test_clear_credentials_calls_delete(tmp_path, monkeypatch):
+    monkeypatch.setattr(module, 'STATE_PATH', tmp_path / 'state.json')
     module.clear_credentials()
-    expected_keys = {'USERNAME', 'PASSWORD', 'LINE_TOKEN'}
+    expected_keys = {'BLOB', 'USERNAME', 'PASSWORD', 'LINE_TOKEN'}
     assert {k for _, k in calls} == expected_keys
+
+
+def test_clear_credentials_removes_session_state(tmp_path, monkeypatch):
+    state = tmp_path / 'state.json'
+    state.write_text('{}')
+    monkeypatch.setattr(module, 'STATE_PATH', state)
+    module.clear_credentials()
+    assert not state.exists()
+
@@ -0,0 +1,53 @@
+import asyncio
+import datetime as dt
+import importlib
+from unittest.mock import AsyncMock
+import sys
+import types
+
+# Stub heavy optional dependencies before importing the target module
+for name in [
+    'aiohttp',
+    'keyring',
+    'dotenv',
+    'rich',
+    'rich.console',
+    'rich.table',
+    'playwright',
+    'playwright.async_api',
+]:
+    if name not in sys.modules:
+        sys.modules[name] = types.ModuleType(name)
+
+sys.modules['dotenv'].load_dotenv = lambda *a, **kw: None
+
+class DummyConsole:
+    def __init__(self, *a, **kw):
+        pass
+sys.modules['rich'].print = lambda *a, **kw: None
+sys.modules['rich.console'].Console = DummyConsole
+sys.modules['rich.table'].Table = type('Table', (), {})
+sys.modules['playwright.async_api'].async_playwright = lambda *a, **kw: None
+sys.modules['playwright.async_api'].BrowserContext = type('BrowserContext', (), {})
+sys.modules['playwright.async_api'].TimeoutError = type('TimeoutError', (Exception,), {})
+
+module = importlib.import_module('letus_checker_secure')
+JST = module.JST
+
+
+def test_fetch_upcoming_parses_evaluated_items():
+    page = AsyncMock()
+    page.evaluate.return_value = [
+        {"label": "Report 2024年7月5日 15:30", "link": "https://letus/a"},
+        {"label": "Announcement", "link": None},
+    ]
+    checker = module.LetusChecker(AsyncMock(), None)
+
+    items = asyncio.run(checker.fetch_upcoming(page))
+
+    assert page.evaluate.await_count == 1
+    assert items == [
+        {"label": "Report 2024年7月5日 15:30", "link": "https://letus/a",
+         "due": dt.datetime(2024, 7, 5, 15, 30, tzinfo=JST)},
+        {"label": "Announcement", "link": None, "due": None},
+    ]
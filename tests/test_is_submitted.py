@@ -0,0 +1,130 @@
+import asyncio
+import importlib
+import sys
+import types
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Stub heavy optional dependencies before importing the target module
+for name in [
+    'aiohttp',
+    'keyring',
+    'dotenv',
+    'rich',
+    'rich.console',
+    'rich.table',
+    'playwright',
+    'playwright.async_api',
+]:
+    if name not in sys.modules:
+        sys.modules[name] = types.ModuleType(name)
+
+sys.modules['dotenv'].load_dotenv = lambda *a, **kw: None
+
+class DummyConsole:
+    def __init__(self, *a, **kw):
+        pass
+sys.modules['rich'].print = lambda *a, **kw: None
+sys.modules['rich.console'].Console = DummyConsole
+sys.modules['rich.table'].Table = type('Table', (), {})
+sys.modules['playwright.async_api'].async_playwright = lambda *a, **kw: None
+sys.modules['playwright.async_api'].BrowserContext = type('BrowserContext', (), {})
+sys.modules['playwright.async_api'].TimeoutError = type('TimeoutError', (Exception,), {})
+
+module = importlib.import_module('letus_checker_secure')
+
+
+LINK = "https://letus/a"
+
+
+def make_page(status=200, headers=None, marker_count=0):
+    page = AsyncMock()
+    page.goto.return_value = types.SimpleNamespace(status=status, headers=headers or {})
+    page.locator = MagicMock()
+    page.locator.return_value.or_.return_value.count = AsyncMock(return_value=marker_count)
+    return page
+
+
+def make_checker(status):
+    ctx = AsyncMock()
+    ctx.request.get.return_value = AsyncMock(status=status)
+    return module.LetusChecker(ctx, None)
+
+
+def test_first_check_renders_and_records_validators():
+    checker = make_checker(304)
+    page = make_page(headers={"etag": '"v1"'}, marker_count=1)
+
+    assert asyncio.run(checker.revalidate(LINK)) is None
+    assert asyncio.run(checker.is_submitted(page, LINK)) is True
+
+    checker.ctx.request.get.assert_not_awaited()
+    assert checker._validators[LINK] == {"If-None-Match": '"v1"'}
+
+
+def test_304_reuses_last_state_without_rendering():
+    checker = make_checker(304)
+    page = make_page(headers={"etag": '"v1"', "last-modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+    asyncio.run(checker.is_submitted(page, LINK))
+
+    assert asyncio.run(checker.revalidate(LINK)) is False
+
+    checker.ctx.request.get.assert_awaited_once_with(
+        LINK,
+        headers={"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"},
+        max_redirects=0,
+    )
+    assert page.goto.await_count == 1
+
+
+def test_200_means_changed_and_forces_a_render():
+    checker = make_checker(200)
+    asyncio.run(checker.is_submitted(make_page(headers={"etag": '"v1"'}), LINK))
+
+    assert asyncio.run(checker.revalidate(LINK)) is None
+    assert LINK not in checker._validators
+
+    page = make_page(headers={"etag": '"v2"'}, marker_count=1)
+    assert asyncio.run(checker.is_submitted(page, LINK)) is True
+    assert checker._validators[LINK] == {"If-None-Match": '"v2"'}
+
+
+@pytest.mark.parametrize("status", [303, 403, 404, 503])
+def test_other_statuses_are_not_trusted(status):
+    checker = make_checker(status)
+    asyncio.run(checker.is_submitted(make_page(headers={"etag": '"v1"'}, marker_count=1), LINK))
+
+    assert asyncio.run(checker.revalidate(LINK)) is None
+    assert LINK not in checker._validators
+    assert LINK not in checker._submitted
+
+
+def test_error_page_render_is_not_cached():
+    checker = make_checker(304)
+    asyncio.run(checker.is_submitted(make_page(status=500, headers={"etag": '"err"'}), LINK))
+
+    assert LINK not in checker._validators
+
+
+def test_run_opens_no_page_when_revalidated(monkeypatch):
+    ctx = AsyncMock()
+    checker = module.LetusChecker(ctx, None)
+    due = module.dt.datetime.now(module.JST) + module.dt.timedelta(hours=1)
+
+    async def fake_login():
+        return AsyncMock()
+
+    async def fake_fetch(_):
+        return [{"label": "a", "link": LINK, "due": due}]
+
+    async def fake_revalidate(link):
+        return True
+
+    monkeypatch.setattr(checker, "login", fake_login)
+    monkeypatch.setattr(checker, "fetch_upcoming", fake_fetch)
+    monkeypatch.setattr(checker, "revalidate", fake_revalidate)
+    monkeypatch.setattr(module, "notify", AsyncMock())
+
+    assert asyncio.run(checker.run(2)) == 0
+    ctx.new_page.assert_not_awaited()
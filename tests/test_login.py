@@ -0,0 +1,110 @@
+import asyncio
+import importlib
+import sys
+import types
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Stub heavy optional dependencies before importing the target module
+for name in [
+    'aiohttp',
+    'keyring',
+    'dotenv',
+    'rich',
+    'rich.console',
+    'rich.table',
+    'playwright',
+    'playwright.async_api',
+]:
+    if name not in sys.modules:
+        sys.modules[name] = types.ModuleType(name)
+
+sys.modules['dotenv'].load_dotenv = lambda *a, **kw: None
+
+class DummyConsole:
+    def __init__(self, *a, **kw):
+        pass
+sys.modules['rich'].print = lambda *a, **kw: None
+sys.modules['rich.console'].Console = DummyConsole
+sys.modules['rich.table'].Table = type('Table', (), {})
+sys.modules['playwright.async_api'].async_playwright = lambda *a, **kw: None
+sys.modules['playwright.async_api'].BrowserContext = type('BrowserContext', (), {})
+sys.modules['playwright.async_api'].TimeoutError = type('TimeoutError', (Exception,), {})
+
+module = importlib.import_module('letus_checker_secure')
+
+
+
+async def _never():
+    await asyncio.Event().wait()
+
+
+def make_checker(monkeypatch, *, url_wait, error_wait):
+    page = MagicMock()
+    page.url = "https://sso.example/login"
+    for name in ("goto", "wait_for_selector", "fill", "wait_for_load_state"):
+        setattr(page, name, AsyncMock())
+    page.keyboard.press = AsyncMock()
+    page.wait_for_url = MagicMock(side_effect=lambda *a, **k: url_wait())
+    locators = {
+        "text=Log in": MagicMock(),
+        "text=ログインエラー": MagicMock(),
+    }
+    locators["text=Log in"].first.click = AsyncMock()
+    locators["text=ログインエラー"].first.wait_for = MagicMock(side_effect=lambda *a, **k: error_wait())
+    page.locator = MagicMock(side_effect=lambda sel: locators[sel])
+
+    ctx = AsyncMock()
+    checker = module.LetusChecker(ctx, None)
+    saved = []
+
+    async def fake_new_page():
+        return page
+
+    monkeypatch.setattr(checker, "new_page", fake_new_page)
+    monkeypatch.setattr(module, "load_credentials", lambda: ("u", "p"))
+    monkeypatch.setattr(module, "save_session_state", saved.append)
+    return checker, page, saved
+
+
+def test_login_error_fails_without_waiting_for_timeout(monkeypatch):
+    async def shown():
+        return None
+
+    checker, _, saved = make_checker(monkeypatch, url_wait=_never, error_wait=shown)
+
+    with pytest.raises(RuntimeError, match="Login failed"):
+        asyncio.run(asyncio.wait_for(checker.login(), 1))
+    assert saved == []
+
+
+def test_login_succeeds_on_dashboard_redirect(monkeypatch):
+    async def reached():
+        return None
+
+    checker, page, saved = make_checker(monkeypatch, url_wait=reached, error_wait=_never)
+
+    assert asyncio.run(asyncio.wait_for(checker.login(), 1)) is page
+    assert len(saved) == 1
+
+
+def test_login_timeout_becomes_runtime_error(monkeypatch):
+    async def timed_out():
+        raise module.PlaywrightTimeoutError("Timeout 30000ms exceeded")
+
+    checker, _, saved = make_checker(monkeypatch, url_wait=timed_out, error_wait=_never)
+
+    with pytest.raises(RuntimeError, match="did not reach the dashboard"):
+        asyncio.run(asyncio.wait_for(checker.login(), 1))
+    assert saved == []
+
+
+def test_login_other_errors_propagate(monkeypatch):
+    async def crashed():
+        raise ValueError("page closed")
+
+    checker, _, _ = make_checker(monkeypatch, url_wait=crashed, error_wait=_never)
+
+    with pytest.raises(ValueError):
+        asyncio.run(asyncio.wait_for(checker.login(), 1))
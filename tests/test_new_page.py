@@ -0,0 +1,52 @@
+import asyncio
+import importlib
+import sys
+import types
+from unittest.mock import AsyncMock
+
+# Stub heavy optional dependencies before importing the target module
+for name in [
+    'aiohttp',
+    'keyring',
+    'dotenv',
+    'rich',
+    'rich.console',
+    'rich.table',
+    'playwright',
+    'playwright.async_api',
+]:
+    if name not in sys.modules:
+        sys.modules[name] = types.ModuleType(name)
+
+sys.modules['dotenv'].load_dotenv = lambda *a, **kw: None
+
+class DummyConsole:
+    def __init__(self, *a, **kw):
+        pass
+sys.modules['rich'].print = lambda *a, **kw: None
+sys.modules['rich.console'].Console = DummyConsole
+sys.modules['rich.table'].Table = type('Table', (), {})
+sys.modules['playwright.async_api'].async_playwright = lambda *a, **kw: None
+sys.modules['playwright.async_api'].BrowserContext = type('BrowserContext', (), {})
+sys.modules['playwright.async_api'].TimeoutError = type('TimeoutError', (Exception,), {})
+
+module = importlib.import_module('letus_checker_secure')
+
+
+def test_new_page_blocks_assets_via_cdp():
+    page = AsyncMock()
+    cdp = AsyncMock()
+    ctx = AsyncMock()
+    ctx.new_page.return_value = page
+    ctx.new_cdp_session.return_value = cdp
+    checker = module.LetusChecker(ctx, None)
+
+    assert asyncio.run(checker.new_page()) is page
+
+    ctx.new_cdp_session.assert_awaited_once_with(page)
+    cdp.send.assert_any_await("Network.setBlockedURLs", {"urls": module.BLOCKED_URL_PATTERNS})
+
+
+
+def test_stylesheets_are_not_blocked():
+    assert not any("css" in p or "styles.php" in p for p in module.BLOCKED_URL_PATTERNS)
@@ -0,0 +1,57 @@
+import importlib
+import sys
+import types
+
+import pytest
+
+# Stub heavy optional dependencies before importing the target module
+for name in [
+    'aiohttp',
+    'keyring',
+    'dotenv',
+    'rich',
+    'rich.console',
+    'rich.table',
+    'playwright',
+    'playwright.async_api',
+]:
+    if name not in sys.modules:
+        sys.modules[name] = types.ModuleType(name)
+
+sys.modules['dotenv'].load_dotenv = lambda *a, **kw: None
+
+class DummyConsole:
+    def __init__(self, *a, **kw):
+        pass
+sys.modules['rich'].print = lambda *a, **kw: None
+sys.modules['rich.console'].Console = DummyConsole
+sys.modules['rich.table'].Table = type('Table', (), {})
+sys.modules['playwright.async_api'].async_playwright = lambda *a, **kw: None
+sys.modules['playwright.async_api'].BrowserContext = type('BrowserContext', (), {})
+sys.modules['playwright.async_api'].TimeoutError = type('TimeoutError', (Exception,), {})
+
+module = importlib.import_module('letus_checker_secure')
+
+
+# grid of 60 s slots starting at t=0; next_t is the slot the loop was aiming for
+
+
+def test_run_within_interval_keeps_slot():
+    assert module._next_wake(60.0, 45.0, 60) == 60.0
+
+
+def test_run_ending_exactly_on_slot_keeps_slot():
+    assert module._next_wake(60.0, 60.0, 60) == 60.0
+
+
+def test_overrun_by_less_than_one_interval_skips_to_next_slot():
+    assert module._next_wake(60.0, 75.0, 60) == 120.0
+
+
+@pytest.mark.parametrize("now, expected", [
+    (150.0, 180.0),  # 1.5 intervals late
+    (190.0, 240.0),  # just past a slot
+    (180.0, 180.0),  # exact multiple: lands on a slot, runs immediately
+])
+def test_overrun_by_several_intervals_stays_on_grid(now, expected):
+    assert module._next_wake(60.0, now, 60) == expected
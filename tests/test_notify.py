@@ -0,0 +1,110 @@
+import asyncio
+import datetime as dt
+import importlib
+import sys
+import types
+
+# Stub heavy optional dependencies before importing the target module
+for name in [
+    'aiohttp',
+    'keyring',
+    'dotenv',
+    'rich',
+    'rich.console',
+    'rich.table',
+    'playwright',
+    'playwright.async_api',
+]:
+    if name not in sys.modules:
+        sys.modules[name] = types.ModuleType(name)
+
+sys.modules['dotenv'].load_dotenv = lambda *a, **kw: None
+
+class DummyConsole:
+    def __init__(self, *a, **kw):
+        pass
+sys.modules['rich'].print = lambda *a, **kw: None
+sys.modules['rich.console'].Console = DummyConsole
+sys.modules['rich.table'].Table = type('Table', (), {})
+sys.modules['playwright.async_api'].async_playwright = lambda *a, **kw: None
+sys.modules['playwright.async_api'].BrowserContext = type('BrowserContext', (), {})
+sys.modules['playwright.async_api'].TimeoutError = type('TimeoutError', (Exception,), {})
+
+module = importlib.import_module('letus_checker_secure')
+JST = module.JST
+
+
+class FakeResponse:
+    def __init__(self, status, text):
+        self.status = status
+        self._text = text
+
+    async def text(self):
+        return self._text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    def __init__(self, status=200, text=''):
+        self.calls = []
+        self._resp = FakeResponse(status, text)
+
+    def post(self, url, **kw):
+        self.calls.append((url, kw))
+        return self._resp
+
+
+class RecordingConsole:
+    def __init__(self):
+        self.lines = []
+
+    def print(self, msg, *a, **kw):
+        self.lines.append(msg)
+
+
+def _alerts():
+    due = dt.datetime.now(JST) + dt.timedelta(hours=5, minutes=30)
+    return [{"label": "Report 1", "link": "x", "due": due}]
+
+
+def test_notify_posts_message(monkeypatch):
+    monkeypatch.setattr(module, '_resolve_token', lambda: 'tok')
+    out = RecordingConsole()
+    monkeypatch.setattr(module, 'console', out)
+    http = FakeSession()
+
+    asyncio.run(module.notify(_alerts(), http))
+
+    [(url, kw)] = http.calls
+    assert url == 'https://notify-api.line.me/api/notify'
+    assert kw['headers'] == {'Authorization': 'Bearer tok'}
+    assert '• Report 1 (あと 5h)' in kw['data']['message']
+    assert out.lines == []
+
+
+def test_notify_reports_failure(monkeypatch):
+    monkeypatch.setattr(module, '_resolve_token', lambda: 'tok')
+    out = RecordingConsole()
+    monkeypatch.setattr(module, 'console', out)
+
+    asyncio.run(module.notify(_alerts(), FakeSession(status=401, text='invalid token')))
+
+    assert len(out.lines) == 1
+    assert 'invalid token' in out.lines[0]
+
+
+def test_notify_prints_without_token(monkeypatch):
+    monkeypatch.setattr(module, '_resolve_token', lambda: None)
+    out = RecordingConsole()
+    monkeypatch.setattr(module, 'console', out)
+    http = FakeSession()
+
+    asyncio.run(module.notify(_alerts(), http))
+
+    assert http.calls == []
+    assert '• Report 1 (あと 5h)' in out.lines[0]
@@ -6,7 +6,7 @@ import types
 # Stub heavy optional dependencies before importing the target module
 for name in [
     'keyring',
-    'requests',
+    'aiohttp',
     'dotenv',
     'rich',
     'rich.console',
@@ -28,6 +28,7 @@ sys.modules['rich.console'].Console = DummyConsole
 sys.modules['rich.table'].Table = type('Table', (), {})
 sys.modules['playwright.async_api'].async_playwright = lambda *a, **kw: None
 sys.modules['playwright.async_api'].BrowserContext = type('BrowserContext', (), {})
+sys.modules['playwright.async_api'].TimeoutError = type('TimeoutError', (Exception,), {})
 
 module = importlib.import_module('letus_checker_secure')
 parse_due_date = module.parse_due_date
@@ -48,3 +49,9 @@ def test_parse_english_date_with_ampm():
 
 def test_unmatched_returns_none():
     assert parse_due_date("no date here") is None
+
+
+def test_parse_english_date_case_insensitive():
+    text = "12 DECEMBER 2024, 11:59 am"
+    expected = dt.datetime(2024, 12, 12, 11, 59, tzinfo=JST)
+    assert parse_due_date(text) == expected
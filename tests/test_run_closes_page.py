@@ -13,9 +13,9 @@ keyring.set_password = lambda *a, **k: None
 keyring.get_password = lambda *a, **k: None
 sys.modules['keyring'] = keyring
 
-requests = types.ModuleType('requests')
-requests.post = lambda *a, **k: types.SimpleNamespace(status_code=200, text='')
-sys.modules['requests'] = requests
+aiohttp = types.ModuleType('aiohttp')
+aiohttp.ClientSession = object
+sys.modules['aiohttp'] = aiohttp
 
 dotenv = types.ModuleType('dotenv')
 dotenv.load_dotenv = lambda *a, **k: None
@@ -40,6 +40,7 @@ playwright = types.ModuleType('playwright')
 async_api = types.ModuleType('playwright.async_api')
 async_api.async_playwright = None
 async_api.BrowserContext = object
+async_api.TimeoutError = type('TimeoutError', (Exception,), {})
 playwright.async_api = async_api
 sys.modules['playwright'] = playwright
 sys.modules['playwright.async_api'] = async_api
@@ -57,7 +58,9 @@ def test_run_closes_page(monkeypatch):
         closed = True
     page.close.side_effect = close
 
-    checker = lcs.LetusChecker(None)
+    ctx = AsyncMock()
+    ctx.new_page.return_value = AsyncMock()
+    checker = lcs.LetusChecker(ctx, None)
 
     async def fake_login():
         return page
@@ -75,9 +78,108 @@ def test_run_closes_page(monkeypatch):
     monkeypatch.setattr(checker, "login", fake_login)
     monkeypatch.setattr(checker, "fetch_upcoming", fake_fetch)
     monkeypatch.setattr(checker, "is_submitted", fake_is_submitted)
-    monkeypatch.setattr(lcs, "notify", lambda alerts: None)
+    monkeypatch.setattr(lcs, "notify", AsyncMock())
 
     count = asyncio.run(checker.run(2))
 
     assert count == 1
     assert closed
+
+
+def test_run_checks_candidates_on_separate_pages(monkeypatch):
+    page = AsyncMock()
+    task_pages = []
+
+    async def new_page():
+        p = AsyncMock()
+        task_pages.append(p)
+        return p
+
+    ctx = AsyncMock()
+    ctx.new_page.side_effect = new_page
+    checker = lcs.LetusChecker(ctx, None)
+    now = dt.datetime.now(JST)
+
+    async def fake_login():
+        return page
+
+    async def fake_fetch(_):
+        return [
+            {"label": "a", "link": "a", "due": now + dt.timedelta(hours=1)},
+            {"label": "b", "link": "b", "due": now + dt.timedelta(hours=1)},
+            {"label": "late", "link": "late", "due": now + dt.timedelta(days=7)},
+            {"label": "none", "link": "none", "due": None},
+        ]
+
+    async def fake_is_submitted(p, link):
+        assert p is not page
+        return link == "a"
+
+    monkeypatch.setattr(checker, "login", fake_login)
+    monkeypatch.setattr(checker, "fetch_upcoming", fake_fetch)
+    monkeypatch.setattr(checker, "is_submitted", fake_is_submitted)
+    sent = []
+
+    async def fake_notify(alerts, http):
+        sent.extend(alerts)
+    monkeypatch.setattr(lcs, "notify", fake_notify)
+
+    count = asyncio.run(checker.run(2))
+
+    assert count == 1
+    assert [t["label"] for t in sent] == ["b"]
+    assert len(task_pages) == 2
+    assert all(p.close.await_count == 1 for p in task_pages)
+
+
+def test_run_closes_page_on_error(monkeypatch):
+    page = AsyncMock()
+    checker = lcs.LetusChecker(AsyncMock(), None)
+
+    async def fake_login():
+        return page
+
+    async def fake_fetch(_):
+        raise RuntimeError("timeline missing")
+
+    monkeypatch.setattr(checker, "login", fake_login)
+    monkeypatch.setattr(checker, "fetch_upcoming", fake_fetch)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(checker.run(2))
+
+    page.close.assert_awaited_once()
+
+
+def test_run_alerts_sorted_by_due(monkeypatch):
+    checker = lcs.LetusChecker(AsyncMock(), None)
+    now = dt.datetime.now(JST)
+
+    async def fake_login():
+        return AsyncMock()
+
+    async def fake_fetch(_):
+        return [
+            {"label": "later", "link": "later", "due": now + dt.timedelta(hours=5)},
+            {"label": "soon", "link": "soon", "due": now + dt.timedelta(hours=1)},
+        ]
+
+    checked = []
+
+    async def fake_is_submitted(_, link):
+        checked.append(link)
+        return False
+
+    monkeypatch.setattr(checker, "login", fake_login)
+    monkeypatch.setattr(checker, "fetch_upcoming", fake_fetch)
+    monkeypatch.setattr(checker, "is_submitted", fake_is_submitted)
+    sent = []
+
+    async def fake_notify(alerts, http):
+        sent.extend(alerts)
+    monkeypatch.setattr(lcs, "notify", fake_notify)
+
+    asyncio.run(checker.run(6))
+
+    assert checked == ["soon", "later"]
+    assert [t["label"] for t in sent] == ["soon", "later"]
@@ -0,0 +1,86 @@
+import importlib
+import sys
+import types
+
+import pytest
+
+# Stub heavy optional dependencies before importing the target module
+for name in [
+    'aiohttp',
+    'keyring',
+    'dotenv',
+    'rich',
+    'rich.console',
+    'rich.table',
+    'playwright',
+    'playwright.async_api',
+]:
+    if name not in sys.modules:
+        sys.modules[name] = types.ModuleType(name)
+
+sys.modules['dotenv'].load_dotenv = lambda *a, **kw: None
+
+class DummyConsole:
+    def __init__(self, *a, **kw):
+        pass
+sys.modules['rich'].print = lambda *a, **kw: None
+sys.modules['rich.console'].Console = DummyConsole
+sys.modules['rich.table'].Table = type('Table', (), {})
+sys.modules['playwright.async_api'].async_playwright = lambda *a, **kw: None
+sys.modules['playwright.async_api'].BrowserContext = type('BrowserContext', (), {})
+sys.modules['playwright.async_api'].TimeoutError = type('TimeoutError', (Exception,), {})
+
+module = importlib.import_module('letus_checker_secure')
+
+
+@pytest.fixture
+def store(monkeypatch):
+    data = {}
+    monkeypatch.setattr(module.keyring, 'set_password', lambda s, k, v: data.__setitem__(k, v), raising=False)
+    monkeypatch.setattr(module.keyring, 'get_password', lambda s, k: data.get(k), raising=False)
+    monkeypatch.setattr(module.keyring, 'delete_password', lambda s, k: data.pop(k), raising=False)
+    return data
+
+
+def test_save_and_load_secrets_roundtrip(store):
+    assert module.load_secrets() == {}
+    module.save_secrets({'USERNAME': 'u', 'PASSWORD': 'p'})
+    assert list(store) == ['BLOB']
+    assert module.load_secrets() == {'USERNAME': 'u', 'PASSWORD': 'p'}
+
+
+def test_load_credentials_from_blob(store):
+    module.save_secrets({'USERNAME': 'u', 'PASSWORD': 'p'})
+    assert module.load_credentials() == ('u', 'p')
+
+
+def test_legacy_entries_are_migrated_once(store):
+    store.update({'USERNAME': 'u', 'PASSWORD': 'p'})
+    assert module.load_credentials() == ('u', 'p')
+    assert list(store) == ['BLOB']
+    assert module.load_credentials() == ('u', 'p')
+
+
+def test_missing_credentials(store):
+    assert module.load_credentials() == (None, None)
+    assert store == {}
+
+
+@pytest.mark.parametrize('blob', ['{"USERNAME": "u", ', '"just a string"'])
+def test_corrupt_blob_asks_to_reconfigure(store, blob):
+    store['BLOB'] = blob
+    with pytest.raises(RuntimeError, match='--configure'):
+        module.load_credentials()
+
+
+def test_configure_replaces_legacy_entries(store, monkeypatch):
+    store.update({'USERNAME': 'u', 'PASSWORD': 'OLDPASS'})
+    monkeypatch.setattr('builtins.input', lambda *a: 'u')
+    answers = iter(['NEWPASS', ''])
+    monkeypatch.setattr(module.getpass, 'getpass', lambda *a: next(answers))
+    monkeypatch.setattr(module, 'console', types.SimpleNamespace(print=lambda *a, **k: None))
+
+    module.configure()
+
+    assert list(store) == ['BLOB']
+    assert module.load_credentials() == ('u', 'NEWPASS')
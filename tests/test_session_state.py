@@ -0,0 +1,89 @@
+import importlib
+import json
+import os
+import stat
+import sys
+import types
+
+import pytest
+
+# Stub heavy optional dependencies before importing the target module
+for name in [
+    'aiohttp',
+    'keyring',
+    'dotenv',
+    'rich',
+    'rich.console',
+    'rich.table',
+    'playwright',
+    'playwright.async_api',
+]:
+    if name not in sys.modules:
+        sys.modules[name] = types.ModuleType(name)
+
+sys.modules['dotenv'].load_dotenv = lambda *a, **kw: None
+
+class DummyConsole:
+    def __init__(self, *a, **kw):
+        pass
+sys.modules['rich'].print = lambda *a, **kw: None
+sys.modules['rich.console'].Console = DummyConsole
+sys.modules['rich.table'].Table = type('Table', (), {})
+sys.modules['playwright.async_api'].async_playwright = lambda *a, **kw: None
+sys.modules['playwright.async_api'].BrowserContext = type('BrowserContext', (), {})
+sys.modules['playwright.async_api'].TimeoutError = type('TimeoutError', (Exception,), {})
+
+module = importlib.import_module('letus_checker_secure')
+
+
+@pytest.fixture
+def state_path(tmp_path, monkeypatch):
+    path = tmp_path / 'state.json'
+    monkeypatch.setattr(module, 'STATE_PATH', path)
+    return path
+
+
+def test_save_and_load_roundtrip(state_path):
+    state = {'cookies': [{'name': 'MoodleSession', 'value': 'x'}], 'origins': []}
+    module.save_session_state(state)
+    assert module.load_session_state() == state
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='POSIX permission bits')
+@pytest.mark.parametrize('existing', [False, True])
+def test_saved_state_is_owner_only(state_path, existing):
+    old = os.umask(0)
+    try:
+        if existing:
+            state_path.write_text('{}')
+            state_path.chmod(0o644)
+        module.save_session_state({'cookies': [], 'origins': []})
+    finally:
+        os.umask(old)
+    assert stat.S_IMODE(state_path.stat().st_mode) == 0o600
+    assert [p.name for p in state_path.parent.iterdir()] == ['state.json']
+
+
+def test_failed_save_keeps_previous_state(state_path):
+    module.save_session_state({'cookies': [], 'origins': []})
+    with pytest.raises(TypeError):
+        module.save_session_state({'cookies': object()})
+    assert module.load_session_state() == {'cookies': [], 'origins': []}
+    assert [p.name for p in state_path.parent.iterdir()] == ['state.json']
+
+
+def test_missing_state_loads_as_none(state_path):
+    assert module.load_session_state() is None
+
+
+@pytest.mark.parametrize('content', ['{"cookies": [', '[]'])
+def test_corrupt_state_is_discarded(state_path, content):
+    state_path.write_text(content)
+    assert module.load_session_state() is None
+    assert not state_path.exists()
+
+
+def test_unreadable_state_is_left_alone(state_path):
+    state_path.mkdir()
+    assert module.load_session_state() is None
+    assert state_path.is_dir()